@@ -4,12 +4,50 @@
 # found in the LICENSE file. See the AUTHORS file for names of contributors.
 #
 import json
-from typing import Dict
+import math
+from typing import Any, Callable, Dict, Optional
 from pydantic import RootModel, TypeAdapter
 from pydantic.dataclasses import dataclass
 
 from .itypes import URN
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _orjson_dumps(obj: Any, indent=2, default: Optional[Callable[[Any], Any]] = None, option=0) -> Optional[str]:
+    """Serialise 'obj' with orjson into JSON equivalent to what 'json.dumps' would
+    produce. The text differs: non-ASCII characters aren't escaped, floats may be
+    formatted differently ('1e-7' vs '1e-07'), and types like UUID and Enum are
+    serialised rather than rejected. Returns None if the caller should fall back to
+    'json.dumps', which is the case if orjson isn't installed, for indents other
+    than 2, for NaN and infinity (orjson writes them as 'null'), and for anything
+    orjson can't encode (such as integers wider than 64 bits).
+    """
+    if orjson is None or indent not in (None, 2) or _has_non_finite(obj):
+        return None
+    def _default(o):
+        v = default(o)
+        if _has_non_finite(v):
+            raise TypeError("non-finite float")
+        return v
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, default=_default if default else None, option=option).decode('utf-8')
+    except orjson.JSONEncodeError:
+        return None
+
+def _has_non_finite(o: Any) -> bool:
+    if isinstance(o, float):
+        return not math.isfinite(o)
+    if isinstance(o, dict):
+        return any(_has_non_finite(v) for v in o.values())
+    if isinstance(o, (list, tuple)):
+        return any(_has_non_finite(v) for v in o)
+    return False
+
 @dataclass
 class Aspect():
 
@@ -28,7 +66,10 @@ class Aspect():
     def dump_json(self, indent = 2, entity: URN = None) -> str:
         d = self.to_dict()
         if entity: d["$entity"] = entity
-        return json.dumps(d, indent=indent)
+        js = _orjson_dumps(d, indent=indent)
+        if js is None:
+            js = json.dumps(d, indent=indent)
+        return js
 
     @classmethod
     def json_schema(cls, json_schema="https://json-schema.org/draft/2020-12/schema"):
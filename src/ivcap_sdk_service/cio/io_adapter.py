@@ -58,6 +58,12 @@ class _IOBase(ABC):
     def tell(self) -> int:
         pass
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @abstractmethod
     def writable(self) -> bool:
         pass
@@ -116,6 +122,18 @@ class IOWritable(_IOBase):
     def flush(self) -> None:
         pass
 
+    def discard(self) -> None:
+        """Close without publishing what has been written so far. Implementations
+        should override this, the default simply closes."""
+        self.close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # closing publishes the artifact, so don't do that for a failed write
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
 
 class IO_ReadWritable(IOReadable, IOWritable):
     pass
@@ -206,6 +224,11 @@ class Queue(ABC):
     def push(self, m: QueueMessage) -> URN:
         pass
 
+    def push_many(self, ms: Sequence[QueueMessage]) -> List[URN]:
+        """Push a batch of messages. Implementations may override this
+        to amortize per-message overhead."""
+        return [self.push(m) for m in ms]
+
     def push_eos(self) -> URN:
         return self.push(QueueMessage(schema=END_OF_STREAM_SCHEMA, content="{}"))
 
@@ -228,7 +251,7 @@ class Queue(ABC):
         a.__message__ = m
         return a
 
-    def map_aspect(self, out_queue: 'Queue', in_cls: Type[A], mapper: Callable[[A], Aspect]):
+    def map_aspect(self, out_queue: 'Queue', in_cls: Type[A], mapper: Callable[[A], Aspect], concurrency: Optional[int] = None):
         def f(m):
             if m.schema != ASPECT_MSG_SCHEMA:
                 return None
@@ -242,7 +265,7 @@ class Queue(ABC):
                     return QueueMessage.from_aspect(outA)
             else:
                 return None
-        self.map(out_queue, f)
+        self.map(out_queue, f, concurrency)
 
     def ack_aspect(self, aspect: Aspect) -> None:
         """Acknowledge the message behind the aspect"""
@@ -47,6 +47,8 @@ class IvcapIOAdapter(IOAdapter):
         self.cachable_url = cachable_url
         self.queue_url = queue_url
         self.secret_url = secret_url
+        # keep the connections to the data proxy and sidecars alive between calls
+        self._session = requests.Session()
 
     def read_artifact(self, artifact_id: str, binary_content=True, no_caching=False, seekable=False) -> IOReadable:
         """Return a readable file-like object providing the content of an artifact
@@ -100,7 +102,7 @@ class IvcapIOAdapter(IOAdapter):
                 curl = url
             else:
                 curl = self.cachable_url(url)
-        r = requests.head(curl)
+        r = self._session.head(curl)
         if r.status_code >= 400:
             raise Exception(f"cannot get HEAD of {curl}")
         n = r.headers.get('X-Artifact-Id')
@@ -242,7 +244,7 @@ class IvcapIOAdapter(IOAdapter):
                 "secret-type": secret_type,
             }
 
-            response = requests.get(url, params=params, timeout=timeout)
+            response = self._session.get(url, params=params, timeout=timeout)
             response.raise_for_status()
 
             if not response.content:
@@ -329,8 +331,8 @@ class IvcapCollectionIter:
 
     def _get_queue(self):
         try:
-            logger.debug(f"Check queue '{self._urn}' if there is more")
-            r = requests.get(self._url, allow_redirects=False)
+            logger.debug("Check queue '%s' if there is more", self._urn)
+            r = self._adapter._session.get(self._url, allow_redirects=False)
             return r
         except:
             logger.fatal(f"while checking queue '{self._urn}' - {self._url} - {sys.exc_info()}")
@@ -340,8 +342,8 @@ class IvcapCollectionIter:
         if not self._ack_token:
             return
         try:
-            logger.debug(f"Ack artifact from queue '{self._urn}'")
-            r = requests.delete(self._url, data=self._ack_token)
+            logger.debug("Ack artifact from queue '%s'", self._urn)
+            r = self._adapter._session.delete(self._url, data=self._ack_token)
             self._ack_token = None
             return r
         except:
@@ -376,6 +378,7 @@ class IvcapQueueService(QueueService):
         """
         self.base_url = base_url
         self.timeout = timeout
+        self._session = requests.Session()
 
     def _construct_url(self, endpoint):
         """
@@ -451,7 +454,7 @@ class IvcapQueueService(QueueService):
         try:
             logger.debug(f"List queues with params: {params}")
             url = self._construct_url("")
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -510,7 +513,7 @@ class IvcapQueueService(QueueService):
         try:
             logger.debug(f"Create queue with data: {data}")
             url = self._construct_url("")
-            response = requests.post(url, json=data, timeout=self.timeout)
+            response = self._session.post(url, json=data, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -547,7 +550,7 @@ class IvcapQueueService(QueueService):
         try:
             logger.debug(f"Delete queue with ID: {queue_id}")
             url = self._construct_url(queue_id)
-            response = requests.delete(url, timeout=self.timeout)
+            response = self._session.delete(url, timeout=self.timeout)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to delete queue: {e}")
@@ -589,7 +592,7 @@ class IvcapQueueService(QueueService):
         try:
             logger.debug(f"Read queue with ID: {queue_id}")
             url = self._construct_url(queue_id)
-            response = requests.get(url, timeout=self.timeout)
+            response = self._session.get(url, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -648,7 +651,7 @@ class IvcapQueueService(QueueService):
 
             json_data = json.dumps(message)
 
-            response = requests.post(
+            response = self._session.post(
                 url,
                 params=params,
                 headers=headers,
@@ -710,7 +713,7 @@ class IvcapQueueService(QueueService):
         try:
             logger.debug(f"Dequeue messages from queue with ID: {queue_id}")
             url = self._construct_url(f"{queue_id}/messages")
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self._session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
 
             if not response.content:
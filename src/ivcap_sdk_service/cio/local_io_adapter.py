@@ -17,8 +17,9 @@ import pathlib
 from queue import Empty, SimpleQueue, Queue as StdQueue
 import re
 import shutil
-from threading import Lock
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
+from threading import BoundedSemaphore, Lock, Timer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, TypeVar, Union
 from os import access, R_OK, walk
 from os.path import isfile, join
 from urllib.parse import urlparse
@@ -481,6 +482,7 @@ class LocalQueueMessage(AcknowledgableQueueMessage):
                 self._queue._log(self._origPath, MsgState.Consumed)
                 self._origPath = None
                 self._pendingPath = None
+            self._queue._restore_deferred_eos()
 
     def release(self) -> None:
         """Release a message as not being processed and should be put back into the queue"""
@@ -492,13 +494,87 @@ class LocalQueueMessage(AcknowledgableQueueMessage):
                 self._queue._log(self._origPath, MsgState.Released)
                 # with open(self._queue._log_file, "a") as f:
                 #     f.write(f"{os.path.basename(self._origPath)},{MsgState.Released},{int(time.time())}\n")
+            self._queue._restore_deferred_eos()
 
 
 EOS_LABEL = 99999999999
 
+DEF_MAP_BATCH_SIZE = 32
+DEF_MAP_FLUSH_INTERVAL_SEC = 1.0
+
 T = TypeVar("T")
 
 
+class _MapBatch:
+    """Collects the results of a 'map' and pushes them to 'out_queue' in
+    batches of 'batch_size' messages, or 'flush_interval' seconds after the
+    first result got buffered. Input messages are only acked once their
+    results have been pushed."""
+
+    def __init__(self, out_queue: Queue, batch_size: int, flush_interval: float) -> None:
+        self._out_queue = out_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._lock = Lock()
+        self._results: List[QueueMessage] = []
+        self._done: List[AcknowledgableQueueMessage] = []
+        self._timer = None
+        self._error = None
+        self._idle = False
+
+    def add(self, results: Sequence[QueueMessage], m: AcknowledgableQueueMessage):
+        with self._lock:
+            self._raise_error()
+            self._results.extend(results)
+            self._done.append(m)
+            if self._idle or len(self._results) >= self._batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = Timer(self._flush_interval, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._raise_error()
+            self._flush()
+
+    def idle(self):
+        """No input is ready, so there is nothing to gain from holding back
+        results until more messages got pulled."""
+        with self._lock:
+            self._idle = True
+            self._raise_error()
+            self._flush()
+
+    def busy(self):
+        self._idle = False
+
+    def _on_timer(self):
+        with self._lock:
+            try:
+                self._flush()
+            except BaseException as err:
+                # reported on the next 'add' or 'flush'
+                self._error = err
+
+    def _flush(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._results:
+            self._out_queue.push_many(self._results)
+        done = self._done
+        self._results, self._done = [], []
+        for m in done:
+            m.ack()
+
+    def _raise_error(self):
+        if self._error:
+            err, self._error = self._error, None
+            raise err
+
+
 class BaseQueue(Queue):
     def __init__(
         self,
@@ -513,6 +589,7 @@ class BaseQueue(Queue):
         self._lease = lease
         self._timeout = timeout
         self._is_closed = False
+        self._on_idle = None  # called by 'pull' before waiting for new messages
 
     @property
     def name(self) -> str:
@@ -543,28 +620,125 @@ class BaseQueue(Queue):
     def close(self):
         self._is_closed = True
 
-    def map(self, out_queue: Queue, mapper: Callable[[QueueMessage], QueueMessage]):
+    def map(
+        self,
+        out_queue: Queue,
+        mapper: Callable[[QueueMessage], QueueMessage],
+        concurrency: Optional[int] = None,
+        batch_size: int = DEF_MAP_BATCH_SIZE,
+        flush_interval: float = DEF_MAP_FLUSH_INTERVAL_SEC,
+    ):
+        if concurrency is None:
+            from ..ivcap import get_config  # break import loop
+
+            # no config (e.g. a TestQueue used without 'init') means no concurrency
+            concurrency = getattr(get_config(), "CONCURRENCY", None) or 1
+        batch = _MapBatch(out_queue, batch_size, flush_interval)
+        if concurrency > 1:
+            return self._map_concurrent(out_queue, mapper, concurrency, batch)
+
         count = 0
-        while True:
-            m = self.pull()
-            if m.schema == END_OF_STREAM_SCHEMA:
-                out_queue.push(m)
-                m.ack()
-                break
-            else:
-                outm = mapper(m)
-                if outm:
-                    if type(outm) in [list, tuple]:
-                        for m2 in outm:
-                            out_queue.push(m2)
-                    else:
-                        out_queue.push(outm)
+        pull = self.pull
+        map_one = self._map_one
+        self._on_idle = batch.idle
+        try:
+            while True:
+                m = pull()
+                batch.busy()
+                if m.schema == END_OF_STREAM_SCHEMA:
+                    batch.flush()
+                    out_queue.push(m)
                     m.ack()
-                    count += 1
+                    break
                 else:
-                    m.release()
+                    if map_one(batch, mapper, m):
+                        count += 1
+        finally:
+            self._on_idle = None
+            # push whatever got mapped before an error
+            batch.flush()
         logger.info(f"done processing {count} message")
 
+    def _map_concurrent(
+        self,
+        out_queue: Queue,
+        mapper: Callable[[QueueMessage], QueueMessage],
+        concurrency: int,
+        batch: _MapBatch,
+    ):
+        count = 0
+        errors = []
+        lock = Lock()
+        # limit the number of messages pulled but not yet processed
+        slots = BoundedSemaphore(2 * concurrency)
+
+        def run(m):
+            nonlocal count
+            try:
+                if self._map_one(batch, mapper, m, release_on_error=True):
+                    with lock:
+                        count += 1
+            except BaseException as err:
+                errors.append(err)
+            finally:
+                slots.release()
+
+        eos = None
+        self._on_idle = batch.idle
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                while not errors:
+                    slots.acquire()
+                    m = self.pull()
+                    batch.busy()
+                    if m.schema == END_OF_STREAM_SCHEMA:
+                        slots.release()
+                        eos = m
+                        break
+                    if errors:
+                        # a worker failed while we were waiting for this one
+                        slots.release()
+                        m.release()
+                        break
+                    executor.submit(run, m)
+        finally:
+            self._on_idle = None
+            # push whatever got mapped before an error
+            batch.flush()
+        try:
+            if errors:
+                raise errors[0]
+            out_queue.push(eos)
+        except BaseException:
+            # don't leave the EOS pending when giving up on the stream
+            if eos is not None:
+                eos.release()
+            raise
+        eos.ack()
+        logger.info(f"done processing {count} message")
+
+    def _map_one(
+        self,
+        batch: _MapBatch,
+        mapper: Callable[[QueueMessage], QueueMessage],
+        m: QueueMessage,
+        release_on_error: bool = False,
+    ) -> bool:
+        try:
+            outm = mapper(m)
+        except BaseException:
+            # only if the mapper failed - once 'm' is handed to the batch, it's up
+            # to the batch to push its results and ack it
+            if release_on_error:
+                m.release()
+            raise
+        if outm:
+            batch.add(outm if type(outm) in [list, tuple] else [outm], m)
+            return True
+        else:
+            m.release()
+            return False
+
     def __iter__(self):
         return QueueIter(self)
 
@@ -602,6 +776,7 @@ class LocalQueue(BaseQueue):
         self._idx_file = os.path.join(self._path, "_idx")
         self._msg_glob = os.path.join(self._path, "*.json")
         self._pending_glob = os.path.join(self._pending_path, "*.json")
+        self._pending_eos_glob = os.path.join(self._pending_path, f"{EOS_LABEL}--*.json")
         self._queue = None
         self._lock = Lock()
         self._observer = None
@@ -617,7 +792,7 @@ class LocalQueue(BaseQueue):
         # clean out pending - should only be EOS messages
         for f in glob.glob(os.path.join(self._pending_path, "*")):
             os.remove(f)
-        logger.debug(f"Queue#{self._name} closed")
+        logger.debug("Queue#%s closed", self._name)
 
     def push(self, m: QueueMessage) -> URN:
         with FileLock(self._lock_file):
@@ -625,16 +800,33 @@ class LocalQueue(BaseQueue):
             fn = "{:08d}.json".format(n)
             with open(os.path.join(self._path, fn), "w") as f:
                 m.id = f"{self._id_prefix}{n}"
-                logger.debug(f"Queue#{self._name} pushing message id '{n}'")
+                logger.debug("Queue#%s pushing message id '%s'", self._name, n)
                 f.write(m.to_json(indent=2))
             self._log(fn, MsgState.Added)
             # with open(self._log_file, "a") as f:
             #     f.write(f"{fn},{MsgState.Added},{int(time.time())}")
 
-    def _get_next_msg_id(self):
+    def push_many(self, ms: Sequence[QueueMessage]) -> List[URN]:
+        if not ms:
+            return []
+        # take the lock and reserve the message ids only once for the entire batch
+        with FileLock(self._lock_file):
+            last = self._get_next_msg_id(len(ms))
+            ids = []
+            for n, m in enumerate(ms, last - len(ms) + 1):
+                fn = "{:08d}.json".format(n)
+                with open(os.path.join(self._path, fn), "w") as f:
+                    m.id = f"{self._id_prefix}{n}"
+                    f.write(m.to_json(indent=2))
+                self._log(fn, MsgState.Added)
+                ids.append(m.id)
+            logger.debug("Queue#%s pushed %d messages", self._name, len(ms))
+            return ids
+
+    def _get_next_msg_id(self, count: int = 1):
         with open(self._idx_file, "r+") as f:
             c = f.read()
-            n = int(c) + 1
+            n = int(c) + count
             f.seek(0)
             f.write(f"{n}")
             f.flush()
@@ -652,7 +844,7 @@ class LocalQueue(BaseQueue):
             try:
                 if _timeout:
                     logger.debug(
-                        f"Queue#{self._name}: waiting for new messages - {_timeout}"
+                        "Queue#%s: waiting for new messages - %s", self._name, _timeout
                     )
                 p = q.get(block, _timeout)
                 m = self._pull(p)
@@ -665,16 +857,19 @@ class LocalQueue(BaseQueue):
                 rem = abs_timeout - int(time.time())
                 if rem <= 0:
                     raise QueueTimeoutException()
+                if not block and self._on_idle:
+                    self._on_idle()
                 block = True
-                _timeout = self._calc_queue_timeout(rem)
+                with FileLock(self._lock_file):
+                    _timeout = self._calc_queue_timeout(rem)
 
     def _pull(self, mpath) -> AcknowledgableQueueMessage:
         with FileLock(self._lock_file):
-            logger.debug(f"Queue#{self._name} checking for '{mpath}'")
+            logger.debug("Queue#%s checking for '%s'", self._name, mpath)
             if not os.path.exists(mpath):
                 return None
             fn = os.path.basename(mpath)
-            logger.debug(f"Queue#{self._name} found '{fn}'")
+            logger.debug("Queue#%s found '%s'", self._name, fn)
             with open(mpath, "r") as f:
                 s = f.read()
                 m = LocalQueueMessage.from_json(s)
@@ -703,6 +898,14 @@ class LocalQueue(BaseQueue):
         else:
             return m
 
+    def _restore_deferred_eos(self):
+        # An EOS pulled while other messages were still pending got parked in
+        # '_pending'. Put it back as soon as it is the last one left, rather
+        # than waiting for a blocked 'pull' to time out.
+        if self._queue is not None and glob.glob(self._pending_eos_glob):
+            with FileLock(self._lock_file):
+                self._calc_queue_timeout(0)
+
     def has_pending_messages(self) -> bool:
         for f in glob.glob(self._pending_glob):
             if os.path.isfile(f):
@@ -738,8 +941,12 @@ class LocalQueue(BaseQueue):
                 # timed out - put back in service
                 msg = f"{m[2]}.json"
                 mp = os.path.join(self._path, msg)
-                shutil.move(pp, mp)
-                logger.debug(f"Queue#{self._name} restoring msg '{mp}'")
+                try:
+                    shutil.move(pp, mp)
+                except FileNotFoundError:
+                    # already acked or restored by another process
+                    continue
+                logger.debug("Queue#%s restoring msg '%s'", self._name, mp)
                 self._get_queue().put(mp)
                 timeout = 0
                 self._log(msg, MsgState.Timedout)
@@ -756,7 +963,7 @@ class LocalQueue(BaseQueue):
                 queue = SimpleQueue()
                 with FileLock(self._lock_file):
                     for fn in sorted(filter(os.path.isfile, glob.glob(self._msg_glob))):
-                        logger.debug(f"Queue#{self._name} adding msg '{fn}'")
+                        logger.debug("Queue#%s adding msg '%s'", self._name, fn)
                         queue.put(fn)
 
                 # track new incoming messages
@@ -767,7 +974,7 @@ class LocalQueue(BaseQueue):
                     def on_closed(self, event):
                         mpath = event.src_path
                         if fnmatch.fnmatch(mpath, msg_glob):
-                            logger.debug(f"Queue#{qname} adding msg '{mpath}'")
+                            logger.debug("Queue#%s adding msg '%s'", qname, mpath)
                             queue.put(mpath)
 
                 self._queue = queue
@@ -7,6 +7,7 @@ from builtins import BaseException
 from typing import IO, Any, AnyStr, Callable, List, Optional
 import tempfile
 import io
+import os
 from ..logger import sys_logger as logger
 
 from .io_adapter import IOWritable
@@ -43,6 +44,7 @@ class WritableFile(IOWritable):
         self.cnt = 0
         self._on_close = on_close
         self._closed = False
+        self._is_temp = use_temp_file
 
     @property
     def urn(self) -> str:
@@ -113,5 +115,14 @@ class WritableFile(IOWritable):
         finally:
             self._file_obj.close()
 
+    def discard(self):
+        self._closed = True
+        self._file_obj.close() # temp files get deleted on close
+        if not self._is_temp:
+            try:
+                os.remove(self._name)
+            except FileNotFoundError:
+                pass
+
     def __repr__(self):
         return f"<WritableFile name={self._name} closed={self._closed} mode={self._mode} fp={self._file_obj}>"
@@ -127,6 +127,10 @@ class WritableProxy(IOWritable):
         finally:
             self._file_obj.close()
 
+    def discard(self):
+        self._closed = True
+        self._file_obj.close() # deletes the temp file without uploading it
+
     def _upload(
         self,
     ) -> str:
@@ -154,7 +158,7 @@ class WritableProxy(IOWritable):
         if len(metadata) == 1 and len(metadata[0].keys()) <= 5:
             # Immediately upload simple metadata
             metadataUploaded = True
-            headers['X-Metadata'] = ','. join(map(lambda e: f"{e[0]} {encode64(str(e[1]))}", metadata[0].items()))
+            headers['X-Metadata'] = ','.join(f"{k} {encode64(str(v))}" for k, v in metadata[0].items())
 
         try:
             logger.debug("Post artifact data='%s', headers:'%s'", fd, headers)
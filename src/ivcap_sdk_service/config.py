@@ -6,7 +6,7 @@
 import base64
 from dataclasses import dataclass
 import os
-from argparse import ArgumentParser, ArgumentTypeError
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
 from pathlib import Path
 from typing import MutableSequence, Callable, Dict
 import sys
@@ -55,56 +55,68 @@ class Config:
 
   SCHEMA_PREFIX: str
   QUEUE_PREFIX: str  
+  CONCURRENCY: int
   
   SERVICE_ARGS: MutableSequence[str]
   SERVICE_COMMAND: Command = Command.SERVICE_RUN
 
+  _parser = (None, None) # (key, ArgumentParser) of the last parser built, set per class
 
   def __init__(self, argv:Dict[str, str] = None, modify_ap: Callable[[ArgumentParser], ArgumentParser] = None):
     prog = os.path.basename(sys.argv[0])
     if prog == '__main__.py' or prog == '-m':
         prog = self._def_prog_name()
 
-    ap = ArgumentParser(prog=prog, description='Execute a service to create information products.')
-    self.add_arguments(ap)
-
+    ap = self._get_parser(prog)
     if argv is None:
         argv = getProgramArgs()
     pargs, self.SERVICE_ARGS = ap.parse_known_args(argv)
-    args = vars(pargs)
-
-    self._set(args)
+    self._set(pargs)
 
   def _def_prog_name(self):
     return "ivcap-service"
 
-  def _set(self, args):
+  def _get_parser(self, prog: str) -> ArgumentParser:
+    # Parsers can be reused across 'parse_known_args' calls. Only rebuild
+    # when the environment the argument defaults are derived from changed.
+    # The cache is looked up in the class' own '__dict__' so a subclass
+    # overriding 'add_arguments' never picks up its parent's parser.
+    cls = type(self)
+    key = (prog, os.getcwd(), tuple(sorted(os.environ.items())))
+    cached_key, ap = cls.__dict__.get('_parser', (None, None))
+    if cached_key != key:
+        ap = ArgumentParser(prog=prog, description='Execute a service to create information products.')
+        self.add_arguments(ap)
+        cls._parser = (key, ap)
+    return ap
+
+  def _set(self, pargs: Namespace):
     order_id_def = os.getenv('IVCAP_ORDER_ID')
     node_id_def = os.getenv('ARGO_NODE_ID')
 
-    if args.pop('ivcap:service_help', False):
+    if getattr(pargs, 'ivcap:service_help', False):
         self.SERVICE_COMMAND = Command.SERVICE_HELP
-    elif args.pop('ivcap:print_service_description', False):
+    elif getattr(pargs, 'ivcap:print_service_description', False):
         self.SERVICE_COMMAND = Command.SERVICE_FILE
 
-    self.ORDER_ID = args.pop('ivcap:order_id', order_id_def)
+    self.ORDER_ID = getattr(pargs, 'ivcap:order_id', order_id_def)
     if not self.ORDER_ID:
         self.ORDER_ID = "urn:ivcap:order:00000000-0000-0000-0000-000000000000"
         if INSIDE_ARGO:
             logger.warn("missing 'order-id'")
         
-    self.NODE_ID = args.pop('ivcap:node_id', node_id_def)
+    self.NODE_ID = getattr(pargs, 'ivcap:node_id', node_id_def)
 
-    self.CACHE_PROXY_URL = args.pop('ivcap:cache_proxy', None)
-    cacheDir = args.pop('ivcap:cache_dir', None)
+    self.CACHE_PROXY_URL = getattr(pargs, 'ivcap:cache_proxy', None)
+    cacheDir = getattr(pargs, 'ivcap:cache_dir', None)
     if cacheDir != '':
         self.CACHE = Cache(cache_dir=cacheDir)
     else:
         self.CACHE = None
 
-    self.STORAGE_URL = args.pop('ivcap:storage_url', None)
-    in_dir = args.pop('ivcap:in_dir', None)
-    self.OUT_DIR = args.pop('ivcap:out_dir', DEF_OUT_DIR)
+    self.STORAGE_URL = getattr(pargs, 'ivcap:storage_url', None)
+    in_dir = getattr(pargs, 'ivcap:in_dir', None)
+    self.OUT_DIR = getattr(pargs, 'ivcap:out_dir', DEF_OUT_DIR)
     if self.STORAGE_URL:
       self.IO_ADAPTER = IvcapIOAdapter(
         storage_url = self.STORAGE_URL,
@@ -117,8 +129,9 @@ class Config:
     else:
       self.IO_ADAPTER = LocalIOAdapter(in_dir=in_dir, out_dir=self.OUT_DIR, cache_dir=cacheDir)
 
-    self.SCHEMA_PREFIX = args.pop('ivcap:schema_prefix', None)
+    self.SCHEMA_PREFIX = getattr(pargs, 'ivcap:schema_prefix', None)
     self.QUEUE_PREFIX = f"{self.SCHEMA_PREFIX}queue:"
+    self.CONCURRENCY = getattr(pargs, 'ivcap:concurrency', 1)
     
   def add_arguments(self, ap):
     order_id_def = os.getenv('IVCAP_ORDER_ID')
@@ -138,6 +151,8 @@ class Config:
     schema_prefix_def = os.getenv('IVCAP_SCHEMA_PREFIX', DEF_SCHEMA_PREFIX)
 
     storage_url_def = os.getenv('IVCAP_STORAGE_URL', None)
+    # left as string so 'type=int' reports a bad value like any other argument
+    concurrency_def = os.getenv('IVCAP_CONCURRENCY', '1')
 
     ap.add_argument("-H", "--ivcap:service-help",
         action='store_true',
@@ -178,30 +193,28 @@ class Config:
         help=f"Schema prefix to use [IVCAP_SCHEMA_PREFIX={schema_prefix_def}]",
         default=schema_prefix_def)
 
+    ap.add_argument("--ivcap:concurrency", metavar="N", type=int,
+        help=f"Number of queue messages to process concurrently [IVCAP_CONCURRENCY={concurrency_def}]",
+        default=concurrency_def)
+
     ap.add_argument("--print-config",
         action='store_true',
         help="Print config settings and exit")      
 
   def cachable_url(self, url: str) -> str:
     """Modify url if there is a cache proxy available"""
-
-    def combine(u1, u2): 
-        if u1.endswith("/"):
-            curl = u1 + u2
-        else:
-            curl = f"{u1}/{u2}"
-        return curl    
-
     if url.startswith(self.SCHEMA_PREFIX):
-        return combine(self.STORAGE_URL, url)
+        return _combine(self.STORAGE_URL, url)
 
     if self.CACHE_PROXY_URL == None:
         return url
     # Call CACHE_PROXY_URL with base64 encoded url as path
-    p = base64.urlsafe_b64encode(url.encode('utf-8')).decode('ascii')
     # data-proxy doesn't like trailing '='
-    while p.endswith("="): p = p[:-1]
-    return combine(self.CACHE_PROXY_URL, p)
+    p = base64.urlsafe_b64encode(url.encode('utf-8')).rstrip(b'=').decode('ascii')
+    return _combine(self.CACHE_PROXY_URL, p)
+
+def _combine(u1: str, u2: str) -> str:
+  return u1 + u2 if u1.endswith("/") else f"{u1}/{u2}"
 
 def verify_file(fname):
   if Path(fname).is_file():
@@ -222,16 +235,17 @@ def verify_protocol(fname):
     raise ArgumentTypeError(f"Protocol '{fname}' is not in supported list '{', '.join(SUPPORTED_PROTOCOLS)}'.")
 
 def getProgramArgs():
-  if os.getenv('IVCAP_ENV0') == None:
+  env = os.environ
+  v = env.get('IVCAP_ENV0')
+  if v is None:
     return sys.argv[1:]
 
   argv = []
   i = 0
-  v = os.getenv(f"IVCAP_ENV{i}")
-  while (v != None):
+  while v is not None:
     argv.append(v)
     i += 1
-    v = os.getenv(f"IVCAP_ENV{i}")
+    v = env.get(f"IVCAP_ENV{i}")
   return argv
 
 def storeConfigInEnv():
@@ -4,7 +4,8 @@
 # found in the LICENSE file. See the AUTHORS file for names of contributors.
 #
 from enum import Enum
-from typing import Dict, NamedTuple, Optional, Union
+from argparse import Namespace
+from typing import Dict, Optional, Union
 from numbers import Number
 
 SCHEMA_KEY = '$schema'
@@ -25,7 +26,7 @@ Url = str
 AspectDict = Dict[str, Union[str, Number, bool]]
 MetaDict = AspectDict
 FilePath = str
-ServiceArgs = NamedTuple
+ServiceArgs = Namespace
 
 class MissingParameterValue(Exception):
     name: str
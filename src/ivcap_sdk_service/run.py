@@ -5,13 +5,13 @@
 #
 
 import os
+import random
 import sys
 import time
 import requests
 
 from typing import Dict, Callable, Sequence, Dict
 from argparse import ArgumentParser, ArgumentError
-from collections import namedtuple
 # import traceback
 
 from .ivcap import init, get_config
@@ -19,6 +19,10 @@ from .logger import logger, sys_logger
 from .service import Service
 from .config import Command, INSIDE_ARGO, INSIDE_CONTAINER
 
+DATA_PROXY_TIMEOUT = (2, 10) # (connect, read) in sec
+DATA_PROXY_BACKOFF = 1.5
+DATA_PROXY_MAX_DELAY = 30 # sec
+
 def run(args: Dict, handler: Callable[[Dict], int]) -> int:
     sys_logger.info(f"Starting service with '{args}'")
     code = handler(args, logger)
@@ -59,9 +63,7 @@ def register_service(service: Service, handler: Callable[[Dict], int]):
     elif cmd == Command.SERVICE_FILE:
         print(service.to_yaml())
     elif cmd == Command.SERVICE_HELP:
-        ap = ArgumentParser(description=service.description, add_help=False)
-        service.append_arguments(ap)
-        ap.print_help()
+        _build_arg_parser(service, add_help=False).print_help()
     else:
         sys_logger.error(f"Unexpected command '{cmd}'")
 
@@ -72,25 +74,31 @@ def wait_for_data_proxy():
 
     url = f"{get_config().STORAGE_URL}/readyz"
     retries = int(os.getenv('IVCAP_DATA_PROXY_RETRIES', 5))
-    delay = int(os.getenv('IVCAP_DATA_PROXY_DELAY', 3))
+    # initial delay, grows by DATA_PROXY_BACKOFF (up to DATA_PROXY_MAX_DELAY) after every failed attempt.
+    # Even with the shortest jitter, the defaults wait longer overall (~20sec) than
+    # the previous fixed 5 x 3sec.
+    delay = float(os.getenv('IVCAP_DATA_PROXY_DELAY', 3))
 
-    for _ in range(retries):
-        sys_logger.info(f"Checking for data-proxy at '{url}'.")
-        try:
-            requests.head(url)
-            return
-        except Exception:
-            sys_logger.info(f"Data-proxy doesn't seem to be ready yet, will wait {delay}sec and try again.")
-            time.sleep(delay)
+    with requests.Session() as session:
+        for _ in range(retries):
+            sys_logger.info(f"Checking for data-proxy at '{url}'.")
+            try:
+                session.head(url, timeout=DATA_PROXY_TIMEOUT)
+                return
+            except Exception:
+                # jitter, so containers started together don't all retry in lockstep
+                wait = delay * random.uniform(0.5, 1.0)
+                sys_logger.info(f"Data-proxy doesn't seem to be ready yet, will wait {wait:.1f}sec and try again.")
+                time.sleep(wait)
+                delay = min(delay * DATA_PROXY_BACKOFF, DATA_PROXY_MAX_DELAY)
     raise Exception(f"Can't contact data-proxy after {retries} retries on '{url}'")
 
 def run_service(service: Service, args: Sequence[str], handler: Callable[[Dict], int]) -> int:
-    ap = ArgumentParser(description=service.description)
+    pargs = _build_arg_parser(service).parse_args(args)
+    return run(pargs, handler)
+
+def _build_arg_parser(service: Service, add_help=True) -> ArgumentParser:
+    ap = ArgumentParser(description=service.description, add_help=add_help)
     # Need to wait for 3.10
     # ap = ArgumentParser(description=service.description, exit_on_error=False)
-    service.append_arguments(ap)
-    pargs = ap.parse_args(args)
-    args = vars(pargs)
-    ST = namedtuple('ServiceArgs', args.keys())
-    at = ST(**args)
-    return run(at, handler)
+    return service.append_arguments(ap)
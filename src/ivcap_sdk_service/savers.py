@@ -5,25 +5,106 @@
 #
 from .ivcap import register_saver
 from .itypes import SupportedMimeTypes
-from typing import Any
-from .cio.io_adapter import IOAdapter, IOWritable
+from typing import Any, Dict, Optional, Tuple
+import importlib.util
+import math
+import os
+import shutil
+import tempfile
+from .cio.io_adapter import IOAdapter
+
+# zlib level for NetCDF variables - level 1 gets most of the size reduction at a fraction of the cost
+DEF_NETCDF_COMPLEVEL = 1
+# target size of a NetCDF (HDF5) chunk in bytes
+NETCDF_CHUNK_BYTES = 1 << 20
+# max threads used to compute dask backed datasets while writing them
+NETCDF_WRITE_WORKERS = 4
 
 def xa_dataset_saver(name: str, data: Any, io_adapter: IOAdapter, **kwargs):
+    complevel = kwargs.pop('complevel', DEF_NETCDF_COMPLEVEL)
+    chunksizes = kwargs.pop('chunksizes', {})
     kwargs['seekable'] = True
     xmeta = data.to_dict(data=False)
     xmeta['@schema'] = 'urn:schema:xarray'
     _append_meta(kwargs, xmeta)
-    fhdl: IOWritable = io_adapter.write_artifact(SupportedMimeTypes.NETCDF, f"{name}.nc", **kwargs)
-    data.to_netcdf(fhdl, compute=True)
-    fhdl.close()
+    if _has_module('h5netcdf'):
+        nc_args = {'engine': 'h5netcdf', 'encoding': _netcdf_encoding(data, complevel, chunksizes)}
+    else:
+        nc_args = {} # xarray's default engine, which may not support chunking or compression
+    with io_adapter.write_artifact(SupportedMimeTypes.NETCDF, name=f"{name}.nc", **kwargs) as fhdl:
+        # xarray's engines need a path to write to (HDF5 also reads back what it writes),
+        # so go through a local file
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, f"{name}.nc")
+            _to_netcdf(data, path, **nc_args)
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, fhdl)
+
+def _to_netcdf(data: Any, target: Any, **kwargs):
+    if _is_dask_backed(data):
+        # dask backed - load and encode chunks on a thread pool rather than one after the other
+        delayed = data.to_netcdf(target, compute=False, **kwargs)
+        delayed.compute(scheduler='threads', num_workers=min(NETCDF_WRITE_WORKERS, os.cpu_count() or 1))
+    else:
+        data.to_netcdf(target, compute=True, **kwargs)
+
+def _is_dask_backed(data: Any) -> bool:
+    # not 'data.chunks', which raises if variables are chunked differently
+    if not _has_module('dask'):
+        return False
+    import dask
+    return dask.is_dask_collection(data)
+
+def _netcdf_encoding(data: Any, complevel: int, chunksizes: Dict[str, Tuple[int, ...]]) -> Optional[Dict[str, Dict]]:
+    """Return a chunked and compressed encoding for all numeric variables in 'data'.
+    'chunksizes' overrides the computed chunk shape for individual variables."""
+    if not hasattr(data, 'data_vars'):
+        return None # DataArray - keep xarray's default encoding
+    encoding = {}
+    for vname, v in data.data_vars.items():
+        if v.ndim == 0 or 0 in v.shape or v.dtype.kind not in 'biufc':
+            continue
+        enc = {'chunksizes': chunksizes.get(vname) or _auto_chunks(v.shape, v.dtype.itemsize)}
+        if complevel:
+            enc.update(zlib=True, complevel=complevel)
+        encoding[vname] = enc
+    return encoding
+
+def _auto_chunks(shape: Tuple[int, ...], itemsize: int, target: int = NETCDF_CHUNK_BYTES) -> Tuple[int, ...]:
+    """Halve dimensions, leading ones first, until a chunk is no larger than 'target' bytes"""
+    chunks = list(shape)
+    i = 0
+    while math.prod(chunks) * itemsize > target and any(c > 1 for c in chunks):
+        if chunks[i] > 1:
+            chunks[i] = (chunks[i] + 1) // 2
+        i = (i + 1) % len(chunks)
+    return tuple(chunks)
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+# zlib level 3 is several times faster than PIL's default (6) for only slightly larger files
+DEF_PNG_COMPRESS_LEVEL = 3
+DEF_JPEG_QUALITY = 85
 
 def png_pil_saver(name: str, img: Any, io_adapter: IOAdapter, **kwargs):
-    _pil_saver(name, img, SupportedMimeTypes.PNG, 'png', io_adapter, kwargs)
+    opts = {
+        'compress_level': kwargs.pop('compress_level', DEF_PNG_COMPRESS_LEVEL),
+        'optimize': kwargs.pop('optimize', False),
+    }
+    _pil_saver(name, img, SupportedMimeTypes.PNG, 'png', io_adapter, kwargs, opts)
 
 def jpeg_pil_saver(name: str, img: Any, io_adapter: IOAdapter, **kwargs):
-    _pil_saver(name, img, SupportedMimeTypes.JPEG, 'jpeg', io_adapter, kwargs)
+    opts = {
+        'quality': kwargs.pop('quality', DEF_JPEG_QUALITY),
+        'optimize': kwargs.pop('optimize', False),
+    }
+    if img.mode not in ('RGB', 'L'):
+        # JPEG has no alpha channel or palette
+        img = img.convert('RGB')
+    _pil_saver(name, img, SupportedMimeTypes.JPEG, 'jpeg', io_adapter, kwargs, opts)
 
-def _pil_saver(name: str, img: Any, mtype: SupportedMimeTypes, format: str, io_adapter: IOAdapter, kwargs):
+def _pil_saver(name: str, img: Any, mtype: SupportedMimeTypes, format: str, io_adapter: IOAdapter, kwargs, opts):
     kwargs['seekable'] = False
     _append_meta(kwargs, {
         '@schema': 'urn:schema:image',
@@ -32,16 +113,40 @@ def _pil_saver(name: str, img: Any, mtype: SupportedMimeTypes, format: str, io_a
         'height': img.height,
         'format': format,
     })
-    fhdl: IOWritable = io_adapter.write_artifact(mtype, f"{name}.{format}", **kwargs)
-    img.save(fhdl, format="png")
-    fhdl.close()
+    buf = _vips_encode(img, format, opts)
+    with io_adapter.write_artifact(mtype, name=f"{name}.{format}", **kwargs) as fhdl:
+        if buf is not None:
+            fhdl.write(buf)
+        else:
+            img.save(fhdl, format=format, **opts)
+
+# libvips only pays off over PIL's encoders for larger images
+VIPS_MIN_PIXELS = 1_000_000
+
+def _vips_encode(img: Any, format: str, opts: dict) -> Optional[bytes]:
+    """Encode a PIL image with libvips if 'pyvips' is installed and the image
+    is large enough. Returns None if PIL should be used instead."""
+    if img.width * img.height < VIPS_MIN_PIXELS or img.mode not in ('L', 'RGB', 'RGBA'):
+        return None
+    try:
+        import pyvips
+        import numpy as np
+    except ImportError:
+        return None
+    vimg = pyvips.Image.new_from_array(np.asarray(img))
+    if format == 'png':
+        return vimg.write_to_buffer(".png", compression=opts['compress_level'])
+    return vimg.write_to_buffer(f".{format}", Q=opts['quality'], optimize_coding=opts['optimize'])
 
 def _append_meta(kwargs, meta):
-    mdl = kwargs.get('metadata', [])
-    if not isinstance(mdl, list):
-        mdl = [mdl]
-    mdl.append(meta)
-    kwargs['metadata'] = mdl
+    mdl = kwargs.get('metadata')
+    if not mdl:
+        kwargs['metadata'] = [meta]
+    elif isinstance(mdl, (list, tuple)):
+        # don't stack up the same metadata when an artifact is saved repeatedly
+        kwargs['metadata'] = list(mdl) if mdl[-1] == meta else [*mdl, meta]
+    else:
+        kwargs['metadata'] = [mdl] if mdl == meta else [mdl, meta]
 
 def register_savers():
     register_saver(SupportedMimeTypes.NETCDF, "<class 'xarray.core.dataset.Dataset'>", xa_dataset_saver)
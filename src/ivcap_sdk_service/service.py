@@ -9,7 +9,6 @@ from dataclasses import dataclass, field
 from dataclass_wizard import JSONWizard, json_field
 from argparse import ArgumentParser
 from typing import List, Any
-import yaml
 from enum import Enum
 import os
 
@@ -21,7 +20,13 @@ from .verifiers import QueueAction, verify_artifact, verify_collection, Artifact
 from .verifiers import verify_aspect, AspectAction, CollectionAction, verify_queue
 from .utils import read_yaml_no_dates
 
-@dataclass
+# defaults for service and workflow declarations - read from the environment once
+_SERVICE_ID = os.getenv('IVCAP_SERVICE_ID', '@SERVICE_ID@')
+_PROVIDER_ID = os.getenv('IVCAP_PROVIDER_ID', '@PROVIDER_ID@')
+_ACCOUNT_ID = os.getenv('IVCAP_ACCOUNT_ID', '@ACCOUNT_ID@')
+_CONTAINER = os.getenv('IVCAP_CONTAINER', '@CONTAINER@')
+
+@dataclass(frozen=True)
 class Option:
     """Defines one option of a `Parameter` of type `OPTION`
     """
@@ -100,7 +105,7 @@ class BasicWorkflow(Workflow):
         gpu_number: specify the number of gpu cards, 1,2 or 4 allowed for now.
     """
     type: str = "basic"
-    image: str = os.getenv('IVCAP_CONTAINER', '@CONTAINER@')
+    image: str = _CONTAINER
     command: List[str] = field(default_factory=list)
     min_memory: str = None
     min_cpu:    str = None
@@ -151,6 +156,19 @@ class PythonWorkflow(BasicWorkflow):
         d['basic']['command'] = ['python', self.script]
         return d
 
+# argparse settings for every parameter type which doesn't depend on the parameter itself
+_TYPE2ARGS: Dict[Type, Dict[str, Any]] = {
+    Type.STRING: dict(type=str, metavar="STRING"),
+    Type.URN: dict(type=URN, metavar="URN"),
+    Type.INT: dict(type=int, metavar="INT"),
+    Type.FLOAT: dict(type=float, metavar="FLOAT"),
+    Type.BOOL: dict(action='store_true', required=False),
+    Type.ARTIFACT: dict(type=verify_artifact, metavar="URN", action=ArtifactAction),
+    Type.ASPECT: dict(type=verify_aspect, metavar="URN", action=AspectAction),
+    Type.COLLECTION: dict(type=verify_collection, metavar="URN", action=CollectionAction),
+    Type.QUEUE: dict(type=verify_queue, metavar="URN", action=QueueAction),
+}
+
 @dataclass
 class Service(JSONWizard):
     """Defines an IVCAP service with all it's necessary components
@@ -169,9 +187,9 @@ class Service(JSONWizard):
     #     skip_defaults = True
 
     name: str
-    id: str = os.getenv('IVCAP_SERVICE_ID', '@SERVICE_ID@')
-    providerID: str = json_field('provider-id', all=True, default=os.getenv('IVCAP_PROVIDER_ID', '@PROVIDER_ID@'))
-    accountID: str = json_field('account-id', all=True, default=os.getenv('IVCAP_ACCOUNT_ID', '@ACCOUNT_ID@'))
+    id: str = _SERVICE_ID
+    providerID: str = json_field('provider-id', all=True, default=_PROVIDER_ID)
+    accountID: str = json_field('account-id', all=True, default=_ACCOUNT_ID)
     parameters: List[Parameter] = field(default_factory=list)
     description: str = None
     workflow: Workflow = field(default_factory=PythonWorkflow.def_workflow)
@@ -181,68 +199,43 @@ class Service(JSONWizard):
         pd = read_yaml_no_dates(serviceFile)
         return cls.from_dict(pd)
 
-    # this function is NOT calling the 'to_dict' of referenced JSONWizard classes
+    # this function is NOT calling the 'to_dict' of referenced JSONWizard classes, and
+    # builds the dict directly as the generic one would serialise parameters and workflow twice
     def to_dict(self):
-        d = super().to_dict()
-        d['parameters'] = list(map(lambda p: p.to_dict(), self.parameters))
-        d['workflow'] = self.workflow.to_dict()
-        return d
+        return {
+            'name': self.name,
+            'id': self.id,
+            'provider-id': self.providerID,
+            'account-id': self.accountID,
+            'parameters': [p.to_dict() for p in self.parameters],
+            'description': self.description,
+            'workflow': self.workflow.to_dict(),
+        }
 
     def to_yaml(self) -> str:
+        import yaml # only needed when printing the service description
         as_dict = self.to_dict()
         as_yaml = yaml.dump(as_dict, default_flow_style=False, default_style='"')
         return as_yaml
 
     def append_arguments(self, ap: ArgumentParser) -> ArgumentParser:
-        type2type = {
-            Type.STRING: str,
-            Type.URN: URN,
-            Type.INT: int,
-            Type.FLOAT: float,
-            Type.BOOL: bool,
-        }
         # optionals = []
         for p in self.parameters:
             if not (p.name and p.type):
                 raise Exception(f"A service parameter needs at least a name and a type - {p}")
             name = p.name
-            if name.startswith('cre:') or name.startswith('ivcap:'):
+            if name.startswith(('cre:', 'ivcap:')):
                 continue
             args:Dict[str, Any] = dict(required = True)
-            if p.type == Type.OPTION:
-                ca = list(map(lambda o: o.value, p.options))
-                args['choices'] = ca
-            elif p.type == Type.ARTIFACT:
-                args['type'] = verify_artifact
-                args['metavar'] = "URN"
-                args['action'] = ArtifactAction
-                pass
-            elif p.type == Type.ASPECT:
-                args['type'] = verify_aspect
-                args['metavar'] = "URN"
-                args['action'] = AspectAction
-                pass
-            elif p.type == Type.COLLECTION:
-                args['type'] = verify_collection
-                args['metavar'] = "URN"
-                args['action'] = CollectionAction
-                pass
-            elif p.type == Type.QUEUE:
-                args['type'] = verify_queue
-                args['metavar'] = "URN"
-                args['action'] = QueueAction
-            elif p.type == Type.BOOL:
-                args['action'] ='store_true'
-                args['required'] = False
+            type_args = _TYPE2ARGS.get(p.type)
+            if type_args:
+                args.update(type_args)
+            elif p.type == Type.OPTION:
+                args['choices'] = [o.value for o in p.options]
+            elif type(p.type) is not Type:
+                raise Exception(f"Wrong type declaration for '{name}' - use enum 'Type'")
             else:
-                if not type(p.type) == Type:
-                    raise Exception(f"Wrong type declaration for '{name}' - use enum 'Type'")
-
-                t = type2type.get(p.type)
-                if not t:
-                    raise Exception(f"Unsupported type '{p.type}' for '{name}'")
-                args['type'] = t
-                args['metavar'] = p.type.name.upper()
+                raise Exception(f"Unsupported type '{p.type}' for '{name}'")
             if p.default:
                 args['default'] = p.default
             if p.description:
@@ -4,19 +4,28 @@
 # found in the LICENSE file. See the AUTHORS file for names of contributors.
 #
 from typing import Any
+import copy
+import functools
+import os
 import yaml
 import json
 from typing import Any
 import yaml
 
 from .logger import sys_logger as logger
-from .aspect import Aspect
+from .aspect import Aspect, _orjson_dumps
 from .itypes import URN
 
 try:
     from yaml import CSafeLoader as SafeLoader, CDumper as Dumper
 except ImportError:
     from yaml import SafeLoader, Dumper
+    logger.debug("libyaml is not available - falling back to the pure python YAML loader")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Remove date parsing of yaml as datetime not serializable
 # https://stackoverflow.com/questions/34667108/ignore-dates-and-times-while-parsing-yaml
@@ -43,30 +52,56 @@ class NoDatesSafeLoader(SafeLoader):
                 for tag, regexp in mappings if tag != tag_to_remove
             ]
 
+NoDatesSafeLoader.remove_implicit_resolver('tag:yaml.org,2002:timestamp')
+
 def read_json(file_name):
-    with open(file_name, 'r') as f:
+    with open(file_name, 'rb') as f:
         data = f.read()
-        params = json.loads(data)
-        return params
+    if orjson:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass # let 'json' deal with NaN, big integers, or report the error
+    return json.loads(data)
 
 def read_yaml(file_name):
     with open(file_name, 'r') as f:
-        params = yaml.safe_load(f)
+        params = yaml.load(f, Loader=SafeLoader)
         return params
 
 def read_yaml_no_dates(file_name):
-    NoDatesSafeLoader.remove_implicit_resolver('tag:yaml.org,2002:timestamp')
-    with open(file_name, 'r') as f:
-        params = yaml.load(f,Loader=NoDatesSafeLoader)
-        return params
+    # only re-parse the file if it changed since the last time it was read. Size and
+    # inode catch rewrites and replacements within the file system's mtime granularity.
+    st = os.stat(file_name)
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    params = _read_yaml_no_dates(os.path.abspath(file_name), stamp)
+    return copy.deepcopy(params)
+
+@functools.lru_cache(maxsize=64)
+def _read_yaml_no_dates(file_name, stamp):
+    with open(file_name, 'rb') as f:
+        raw = f.read()
+    if raw.lstrip().startswith(b'{'):
+        # JSON is valid YAML (without any dates), but a lot faster to parse as JSON
+        try:
+            return orjson.loads(raw) if orjson else json.loads(raw)
+        except ValueError:
+            pass # most likely YAML flow style
+    return yaml.load(raw, Loader=NoDatesSafeLoader)
+
+def _json_default(o):
+    fn = getattr(o, 'tojson', None) or getattr(o, 'to_json', None)
+    if fn is not None:
+        return fn()
+    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
 
 class _CustomEncoder(json.JSONEncoder):
     def default(self, o):
-        if "tojson" in dir(o):
-            return o.tojson()
-        if "to_json" in dir(o):
-            return o.to_json()
-        return json.JSONEncoder.default(self, o)
+        return _json_default(o)
+
+# make orjson hand everything to '_json_default' which the json module wouldn't serialise itself
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS \
+    | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
 
 def json_dump(obj: Any, fileName: str = None, entity: URN = None, failQuietly=True) -> str:
     try:
@@ -77,9 +112,11 @@ def json_dump(obj: Any, fileName: str = None, entity: URN = None, failQuietly=Tr
             if not d.get("$schema"):
                 logger.warning("metadata has no '$schema' declaration - {d}")
             if entity: d["$entity"] = entity
-            js = json.dumps(obj, indent=2, cls=_CustomEncoder)
+            js = _orjson_dumps(obj, indent=2, default=_json_default, option=_ORJSON_OPTIONS)
+            if js is None:
+                js = json.dumps(obj, indent=2, cls=_CustomEncoder)
         if fileName:
-            with open(fileName, "w") as fp:
+            with open(fileName, "w", encoding="utf-8") as fp:
                 fp.write(js)
         return js
     except BaseException as err:
@@ -5,8 +5,6 @@
 #
 from __future__ import annotations
 from argparse import Action, ArgumentTypeError
-import yaml
-import validators
 
 from .ivcap import get_config
 from .config import Resource, INSIDE_CONTAINER
@@ -22,12 +20,13 @@ def verify_artifact(urn):
     #     return urn
     # else:
 
-    if validators.url(urn):
+    if _is_url(urn):
         return urn
     # could be local file
 
-    if not get_config().IO_ADAPTER.artifact_readable(urn):
-        raise ArgumentTypeError(f"Cannot find local file '{urn}' - {get_config().IO_ADAPTER}")
+    io_adapter = get_config().IO_ADAPTER
+    if not io_adapter.artifact_readable(urn):
+        raise ArgumentTypeError(f"Cannot find local file '{urn}' - {io_adapter}")
     return urn
 
 class ArtifactAction(Action):
@@ -39,10 +38,8 @@ class ArtifactAction(Action):
             raise ArgumentTypeError(err)
 
 def verify_collection(urn: str):
-    if is_valid_resource_urn(urn, Resource.COLLECTION):
-        return urn
-    if is_valid_resource_urn(urn, Resource.ARTIFACT):
-        # treating a artifact as a collection of ONE
+    # also treating a artifact as a collection of ONE
+    if is_valid_resource_urn(urn, Resource.COLLECTION, Resource.ARTIFACT):
         return urn
 
 
@@ -75,7 +72,7 @@ def verify_aspect(urn):
     #     return urn
     # else:
 
-    if validators.url(urn):
+    if _is_url(urn):
         return urn
 
     # could be local file
@@ -102,7 +99,7 @@ def verify_queue(urn):
     #     return urn
     # else:
 
-    if validators.url(urn):
+    if _is_url(urn):
         return urn
 
     # could be local file
@@ -119,6 +116,10 @@ class QueueAction(Action):
         except Exception as err:
             raise ArgumentTypeError(err)
 
-def is_valid_resource_urn(urn: str, resource: Resource) -> bool:
-    prefix = f"{get_config().SCHEMA_PREFIX}{resource.value}"
-    return urn.startswith(prefix)
+def _is_url(urn: str) -> bool:
+    import validators # only needed for references which aren't IVCAP URNs
+    return bool(validators.url(urn))
+
+def is_valid_resource_urn(urn: str, *resources: Resource) -> bool:
+    schema_prefix = get_config().SCHEMA_PREFIX
+    return urn.startswith(tuple(f"{schema_prefix}{r.value}" for r in resources))
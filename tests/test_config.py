@@ -1,10 +1,34 @@
+import pytest
+
 from ivcap_sdk_service.config import Config, DEF_OUT_DIR
 from ivcap_sdk_service.cio import LocalIOAdapter
 
-#from ivcap_service.src.ivcap_service.config import DEF_OUT_DIR
-
-def test_config():
+@pytest.mark.parametrize("argv", [[], ["--ivcap:out-dir", "."]], ids=["empty", "out-dir"])
+def test_config(argv):
     """Test reading Config."""
-    cfg = Config([])
-    assert type(cfg.IO_ADAPTER) == LocalIOAdapter
-    #assert cfg.IO_ADAPTER.out_dir == '.'
+    cfg = Config(argv)
+    assert isinstance(cfg.IO_ADAPTER, LocalIOAdapter)
+
+def test_config_subclass_parser():
+    """Test that a Config subclass adding arguments gets its own parser."""
+    class ExtConfig(Config):
+        def add_arguments(self, ap):
+            super().add_arguments(ap)
+            ap.add_argument("--ext", dest="ext", default="def")
+
+        def _set(self, pargs):
+            super()._set(pargs)
+            self.EXT = pargs.ext
+
+    Config([])
+    cfg = ExtConfig(["--ext", "foo"])
+    assert cfg.EXT == "foo"
+    assert cfg.SERVICE_ARGS == []
+    assert Config(["--ext", "foo"]).SERVICE_ARGS == ["--ext", "foo"]
+
+def test_config_bad_concurrency(monkeypatch, capsys):
+    """Test a non-numeric IVCAP_CONCURRENCY is reported as an argument error."""
+    monkeypatch.setenv("IVCAP_CONCURRENCY", "many")
+    with pytest.raises(SystemExit):
+        Config([])
+    assert "invalid int value: 'many'" in capsys.readouterr().err
@@ -0,0 +1,24 @@
+import pytest
+
+from ivcap_sdk_service.cio import LocalIOAdapter
+
+def test_failed_write_is_discarded(tmp_path):
+    """Test an exception inside 'with' doesn't leave a partial artifact."""
+    adapter = LocalIOAdapter(in_dir=str(tmp_path), out_dir=str(tmp_path))
+    published = []
+    with pytest.raises(ValueError):
+        with adapter.write_artifact("image/png", name="x.png", on_close=published.append) as fhdl:
+            fhdl.write(b"partial")
+            raise ValueError("encoder failed")
+    assert fhdl.closed
+    assert published == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_write_is_published(tmp_path):
+    """Test a clean exit from 'with' publishes the artifact."""
+    adapter = LocalIOAdapter(in_dir=str(tmp_path), out_dir=str(tmp_path))
+    published = []
+    with adapter.write_artifact("image/png", name="x.png", on_close=published.append) as fhdl:
+        fhdl.write(b"data")
+    assert len(published) == 1
+    assert (tmp_path / "x.png").read_bytes() == b"data"
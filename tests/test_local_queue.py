@@ -0,0 +1,163 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ivcap_sdk_service.ivcap import init, get_config
+from ivcap_sdk_service.cio.io_adapter import QueueMessage, END_OF_STREAM_SCHEMA
+from ivcap_sdk_service.cio.local_io_adapter import _MapBatch
+
+@pytest.fixture
+def queues(tmp_path):
+    init(["--ivcap:in-dir", str(tmp_path), "--ivcap:out-dir", str(tmp_path),
+          "--ivcap:cache-dir", str(tmp_path / "cache")])
+    adapter = get_config().IO_ADAPTER
+    qin = adapter.get_queue("urn:ivcap:queue#in")
+    qout = adapter.get_queue("urn:ivcap:queue#out")
+    yield qin, qout
+    qin.close()
+    qout.close()
+
+def _messages(q):
+    """Return (schema, content) of all messages waiting in 'q', in order."""
+    ml = [json.loads(p.read_text()) for p in sorted(Path(q._path).glob("*.json"))]
+    return [(m["schema"], m["content"]) for m in ml]
+
+def _pending(q):
+    """Return the file names of all messages pulled from 'q' but not yet acked."""
+    return sorted(p.name.split("--")[1] for p in Path(q._pending_path).glob("*.json"))
+
+def _fill(q, count, eos=True):
+    for i in range(count):
+        q.push(QueueMessage(schema="s", content={"a": i}))
+    if eos:
+        q.push_eos()
+
+def _double(m):
+    return QueueMessage(schema="s", content={"b": m.content["a"] * 2})
+
+@pytest.mark.parametrize("batch_size", [2, 100])
+def test_map_pushes_results_and_acks(queues, batch_size):
+    """Test all results are pushed before the EOS and all inputs are acked."""
+    qin, qout = queues
+    _fill(qin, 5)
+    qin.map(qout, _double, concurrency=1, batch_size=batch_size, flush_interval=60)
+    out = _messages(qout)
+    assert out[:-1] == [("s", {"b": i * 2}) for i in range(5)]
+    assert out[-1][0] == END_OF_STREAM_SCHEMA
+    assert [s for s, _ in _messages(qin)] == [END_OF_STREAM_SCHEMA]
+    assert _pending(qin) == []
+
+def test_map_flushes_when_idle(queues):
+    """Test results are pushed while waiting for more input, before the batch is full."""
+    qin, qout = queues
+    _fill(qin, 2, eos=False)
+    t = threading.Thread(target=qin.map, args=(qout, _double),
+                         kwargs=dict(concurrency=1, batch_size=100, flush_interval=60))
+    t.start()
+    deadline = time.time() + 10
+    while len(_messages(qout)) < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    assert _messages(qout) == [("s", {"b": 0}), ("s", {"b": 2})]
+    assert _pending(qin) == []
+    qin.push_eos()
+    t.join(10)
+    assert not t.is_alive()
+
+def test_batch_flushes_on_timer():
+    """Test buffered results are pushed and acked after 'flush_interval'."""
+    class Out:
+        def __init__(self):
+            self.pushed = []
+        def push_many(self, ms):
+            self.pushed.extend(ms)
+
+    class In:
+        acked = False
+        def ack(self):
+            self.acked = True
+
+    out, m = Out(), In()
+    batch = _MapBatch(out, batch_size=100, flush_interval=0.05)
+    batch.add([QueueMessage(schema="s", content={})], m)
+    assert out.pushed == [] and not m.acked
+    deadline = time.time() + 5
+    while not m.acked and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(out.pushed) == 1 and m.acked
+
+def test_map_error_keeps_buffered_results(queues):
+    """Test a mapper error pushes what was mapped so far and leaves the failing message pending."""
+    qin, qout = queues
+    _fill(qin, 3)
+    def mapper(m):
+        if m.content["a"] == 2:
+            raise ValueError("mapper failed")
+        return _double(m)
+    with pytest.raises(ValueError):
+        qin.map(qout, mapper, concurrency=1, batch_size=100, flush_interval=60)
+    assert _messages(qout) == [("s", {"b": 0}), ("s", {"b": 2})]
+    assert _pending(qin) == ["00000003.json"]
+
+def test_push_many_ids(queues):
+    """Test 'push_many' numbers messages the same way as 'push'."""
+    qin, _ = queues
+    qin.push(QueueMessage(schema="s", content={"a": 0}))
+    ids = qin.push_many([QueueMessage(schema="s", content={"a": i}) for i in (1, 2)])
+    qin.push(QueueMessage(schema="s", content={"a": 3}))
+    files = sorted(Path(qin._path).glob("*.json"))
+    assert [p.name for p in files] == [f"{n:08d}.json" for n in range(1, 5)]
+    written = [json.loads(p.read_text())["id"] for p in files]
+    assert [i.rsplit("-", 1)[1] for i in written] == ["1", "2", "3", "4"]
+    assert ids == written[1:3]
+    assert [c for _, c in _messages(qin)] == [{"a": i} for i in range(4)]
+
+def test_map_concurrent(queues):
+    """Test concurrent mapping pushes all results before the EOS and acks all inputs."""
+    qin, qout = queues
+    _fill(qin, 20)
+    qin.map(qout, _double, concurrency=3, batch_size=4, flush_interval=60)
+    out = _messages(qout)
+    assert sorted(c["b"] for _, c in out[:-1]) == [i * 2 for i in range(20)]
+    assert out[-1][0] == END_OF_STREAM_SCHEMA
+    assert [s for s, _ in _messages(qin)] == [END_OF_STREAM_SCHEMA]
+    assert _pending(qin) == []
+
+def test_map_concurrent_error_releases(queues):
+    """Test a failing mapper releases its message and every input ends up either mapped or queued again."""
+    qin, qout = queues
+    _fill(qin, 10)
+    def mapper(m):
+        if m.content["a"] == 2:
+            raise ValueError("mapper failed")
+        return _double(m)
+    with pytest.raises(ValueError):
+        qin.map(qout, mapper, concurrency=3, batch_size=100, flush_interval=60)
+    assert _pending(qin) == []
+    mapped = [c["b"] // 2 for _, c in _messages(qout)]
+    queued = [c["a"] for s, c in _messages(qin) if s != END_OF_STREAM_SCHEMA]
+    assert 2 in queued
+    assert sorted(mapped + queued) == list(range(10))
+
+def test_map_without_config(tmp_path, monkeypatch):
+    """Test mapping a TestQueue doesn't need 'init' to have been called."""
+    from ivcap_sdk_service import ivcap
+    from ivcap_sdk_service.cio import LocalIOAdapter
+
+    class Out:
+        def __init__(self):
+            self.pushed = []
+        def push(self, m):
+            self.pushed.append(m)
+        def push_many(self, ms):
+            self.pushed.extend(ms)
+
+    monkeypatch.setattr(ivcap, "_CONFIG", None)
+    (tmp_path / "m.json").write_text(QueueMessage(schema="s", content={"a": 1}).to_json())
+    q = LocalIOAdapter(in_dir=str(tmp_path), out_dir=str(tmp_path)).get_queue(f"urn:file://{tmp_path / 'm.json'}")
+    out = Out()
+    q.map(out, _double)
+    assert [m.content for m in out.pushed[:-1]] == [{"b": 2}]
+    assert out.pushed[-1].schema == END_OF_STREAM_SCHEMA
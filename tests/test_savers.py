@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from ivcap_sdk_service import savers
+from ivcap_sdk_service.cio import LocalIOAdapter
+
+@pytest.mark.parametrize("shape,itemsize", [((4096, 4096), 8), ((100, 3000, 7), 4), ((10,), 8), ((1, 1 << 20), 2)])
+def test_auto_chunks(shape, itemsize):
+    """Test chunks fit into the target size and don't exceed the variable's shape."""
+    target = 1 << 16
+    chunks = savers._auto_chunks(shape, itemsize, target)
+    assert len(chunks) == len(shape)
+    assert all(1 <= c <= s for c, s in zip(chunks, shape))
+    assert math.prod(chunks) * itemsize <= target
+
+def test_netcdf_encoding():
+    """Test only numeric, non-scalar variables are encoded and 'chunksizes' takes precedence."""
+    ds = xr.Dataset({
+        "a": (("x", "y"), np.zeros((2000, 1000))),
+        "b": (("x",), np.zeros(2000, dtype="int32")),
+        "name": (("x",), np.array(["n"] * 2000, dtype=object)),
+        "scalar": ((), 1.0),
+        "empty": (("z",), np.zeros(0)),
+    })
+    encoding = savers._netcdf_encoding(ds, 1, {"b": (100,)})
+    assert sorted(encoding) == ["a", "b"]
+    assert math.prod(encoding["a"]["chunksizes"]) * 8 <= savers.NETCDF_CHUNK_BYTES
+    assert encoding["b"]["chunksizes"] == (100,)
+    assert encoding["a"]["complevel"] == 1
+    assert "zlib" not in savers._netcdf_encoding(ds, 0, {})["a"]
+
+@pytest.mark.parametrize("has_h5netcdf", [True, False], ids=["h5netcdf", "default-engine"])
+def test_xa_dataset_saver(tmp_path, monkeypatch, has_h5netcdf):
+    """Test a dataset round trips with and without h5netcdf installed."""
+    if not has_h5netcdf:
+        monkeypatch.setattr(savers, "_has_module", lambda name: name != "h5netcdf")
+    ds = xr.Dataset({"a": (("x",), np.arange(10.0))})
+    adapter = LocalIOAdapter(in_dir=str(tmp_path), out_dir=str(tmp_path))
+    savers.xa_dataset_saver("ds", ds, adapter)
+    with xr.open_dataset(tmp_path / "ds.nc") as back:
+        assert back.equals(ds)
@@ -0,0 +1,65 @@
+from argparse import ArgumentParser
+import pytest
+
+from ivcap_sdk_service.service import Service, Parameter, Option, Type
+from ivcap_sdk_service.verifiers import ArtifactAction, AspectAction, CollectionAction, QueueAction
+from ivcap_sdk_service.verifiers import verify_artifact, verify_aspect, verify_collection, verify_queue
+
+def _parser(params):
+    svc = Service(name="test", parameters=params)
+    return svc.append_arguments(ArgumentParser())
+
+def _parse_args(params, argv):
+    return _parser(params).parse_args(argv)
+
+def test_append_simple_arguments():
+    """Test simple parameter types are converted."""
+    args = _parse_args([
+        Parameter(name="msg", type=Type.STRING),
+        Parameter(name="times", type=Type.INT, default=2),
+        Parameter(name="ratio", type=Type.FLOAT, optional=True),
+        Parameter(name="flag", type=Type.BOOL),
+        Parameter(name="mode", type=Type.OPTION, options=[Option(value="a"), Option(value="b")], default="a"),
+    ], ["--msg", "hi", "--ratio", "0.5"])
+    assert vars(args) == {"msg": "hi", "times": 2, "ratio": 0.5, "flag": False, "mode": "a"}
+
+@pytest.mark.parametrize("ptype, action_class, verifier", [
+    (Type.ARTIFACT, ArtifactAction, verify_artifact),
+    (Type.ASPECT, AspectAction, verify_aspect),
+    (Type.COLLECTION, CollectionAction, verify_collection),
+    (Type.QUEUE, QueueAction, verify_queue),
+], ids=["artifact", "aspect", "collection", "queue"])
+def test_append_reference_argument(ptype, action_class, verifier):
+    """Test reference types get their verifier and action."""
+    ap = _parser([Parameter(name="ref", type=ptype)])
+    action = next(a for a in ap._actions if a.dest == "ref")
+    assert isinstance(action, action_class)
+    assert action.type is verifier
+    assert action.metavar == "URN"
+    assert action.required
+
+def test_skip_ivcap_parameters():
+    """Test 'ivcap:' and 'cre:' parameters are not added."""
+    args = _parse_args([
+        Parameter(name="ivcap:foo", type=Type.STRING),
+        Parameter(name="cre:bar", type=Type.STRING),
+    ], [])
+    assert vars(args) == {}
+
+@pytest.mark.parametrize("param, msg", [
+    (Parameter(name="", type=Type.INT), "needs at least a name and a type"),
+    (Parameter(name="x", type=None), "needs at least a name and a type"),
+    (Parameter(name="x", type="string"), "Wrong type declaration"),
+], ids=["empty-name", "none-type", "wrong-type"])
+def test_invalid_parameter(param, msg):
+    """Test parameters without a name or a proper 'Type' are rejected."""
+    with pytest.raises(Exception, match=msg):
+        _parser([param])
+
+def test_service_to_dict():
+    """Test service description uses the IVCAP key names."""
+    svc = Service(name="test", providerID="urn:p", parameters=[Parameter(name="flag", type=Type.BOOL)])
+    d = svc.to_dict()
+    assert d["provider-id"] == "urn:p"
+    assert d["parameters"] == [{"name": "flag", "type": "bool", "optional": True}]
+    assert d["workflow"]["type"] == "basic"
@@ -0,0 +1,18 @@
+import json
+import pytest
+
+from ivcap_sdk_service.utils import json_dump
+
+def _canonical(js):
+    # re-serialise parsed JSON so equivalent documents compare equal (NaN != NaN)
+    return json.dumps(json.loads(js), sort_keys=True)
+
+@pytest.mark.parametrize("value", [1.5, 1e-7, "é 東京", float("nan"), float("inf"), 2**70],
+                         ids=["float", "exponent", "non-ascii", "nan", "inf", "bigint"])
+def test_json_dump_matches_json(value, tmp_path):
+    """Test metadata is written as JSON equivalent to what the json module would write."""
+    md = {"$schema": "urn:test", "value": value, "list": [value]}
+    fname = tmp_path / "md.json"
+    js = json_dump(md, fileName=str(fname), failQuietly=False)
+    assert _canonical(js) == _canonical(json.dumps(md, indent=2))
+    assert fname.read_text(encoding="utf-8") == js